@@ -1,15 +1,29 @@
 import yaml
 import ollama
+import asyncio
 import os
 import sys
 import json
+import orjson
 import re
+import hashlib
+import pickle
+import math
+import heapq
+import threading
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from jinja2 import Template
 from datetime import date
 import pypandoc
 import unicodedata
+from operator import itemgetter
+from collections import Counter
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1024)
 def latex_escape(text):
     """
     Normalize, flatten, and escape text for LaTeX macros.
@@ -17,47 +31,69 @@ def latex_escape(text):
     if not text:
         return ""
 
-    # Normalize unicode
-    text = unicodedata.normalize("NFKD", text)
-
-    # Replace smart punctuation
-    text = text.replace("’", "'").replace("‘", "'")
-    text = text.replace("“", '"').replace("”", '"')
-    text = text.replace("–", "-").replace("—", "-")
+    # Normalize unicode (ASCII text is already in normal form)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
 
     # Remove line breaks and multiple spaces
-    text = re.sub(r"\s+", " ", text).strip()
-
-    # Escape LaTeX specials
-    replacements = {
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\textasciicircum{}",
-        "\\": r"\textbackslash{}"
-    }
-
-    for k, v in replacements.items():
-        text = text.replace(k, v)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
 
-    return text
+    # Replace smart punctuation and escape LaTeX specials in a single pass,
+    # so the backslashes and braces we insert are never escaped a second time
+    return text.translate(_LATEX_TRANSLATION)
 
 
 # ================= CONFIGURATION =================
 MODEL = "llama3"  # Make sure to run: ollama pull llama3
+TEMPERATURE = 0.2 # Low temp for strict adherence
+OLLAMA_CONCURRENCY = int(os.getenv("OLLAMA_CONCURRENCY", "4"))  # Requests sent to Ollama at once
+STREAM_TO_CONSOLE = os.getenv("CV_STREAM", "0") == "1"          # Echo tokens live (best with OLLAMA_CONCURRENCY=1)
 PROFILE_PATH = "profile.yaml"
 TEMPLATE_PATH = "template_cv.md"
+DOCS_DIR = "docs"
+TEX_BIN_DIR = "/Library/TeX/texbin"  # MacTeX; xelatex lives here
 
 # CV Constraints
 MAX_PROJECTS_TO_SHOW = 3      # The AI will pick the best N projects
 MAX_BULLETS_PER_ROLE = 5      # Max bullets per job experience
 CANDIDATE_POOL_SIZE = 8       # Python sends top N matches to AI to save context
 
+# Profile fields sent to the LLM as compact rows (see to_compact); columns no entry fills are left out
+EXPERIENCE_FIELDS = ("position", "company", "location", "startDate", "endDate", "summary", "highlights",
+                     "keywords", "technologies", "tools")
+PROJECT_FIELDS = ("name", "date", "startDate", "endDate", "description", "highlights",
+                  "keywords", "technologies", "tools", "roles", "url")
+EDUCATION_FIELDS = ("studyType", "area", "institution", "startDate", "endDate", "courses")
+CERTIFICATION_FIELDS = ("name", "issuer", "year", "date")
+
+# Prompt caching
+JD_EXCERPT_CHARS = 1500       # Same JD excerpt in every prompt keeps a shared prefix
+KEEP_ALIVE = "30m"            # Keep the model (and its prompt cache) loaded between sections
+# Fixed context size so the KV cache layout never changes. Sized just above the largest
+# prompt (~1.5k-2.5k tokens: JD excerpt + instructions + profile rows) plus MAX_TOKENS_LONG
+NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "4096"))
+NUM_BATCH = int(os.getenv("OLLAMA_NUM_BATCH", "512"))  # Prompt tokens per prefill batch; lower it on small GPUs
+
+# Decode budgets (num_predict): stop runaway generations well past any usable answer
+MAX_TOKENS_SHORT = 256        # Archetypes, soft skills, certifications
+MAX_TOKENS_MEDIUM = 512       # Summary, education, skills, selections
+MAX_TOKENS_LONG = 1536        # Projects, experience, cover letter
+
+# Parsed YAML cache: skip re-parsing profile.yaml while the file is unchanged
+PARSED_YAML_CACHE_DIR = os.path.join(DOCS_DIR, ".cache")
+
+# Generation cache: reuse outputs of identical prompts from previous runs
+PROMPT_VERSION = 1            # Bump when prompts or output cleaning change, to invalidate cached sections
+GENERATION_CACHE_PATH = os.path.join(DOCS_DIR, ".cache", "generations.json")
+GENERATION_CACHE_MAX_ENTRIES = 500
+USE_GENERATION_CACHE = os.getenv("CV_CACHE", "1") != "0"  # CV_CACHE=0 always regenerates
+
+# Semantic cache: reuse sections generated for a similar JD with the same profile data
+EMBED_MODEL = "nomic-embed-text"  # Optional: ollama pull nomic-embed-text
+SEMANTIC_CACHE_PATH = os.path.join(DOCS_DIR, ".cache", "semantic_cache.json")
+SEMANTIC_CACHE_THRESHOLD = 0.92   # Minimum cosine similarity between JD embeddings
+SEMANTIC_CACHE_MAX_ENTRIES = 200
+
 # Phrases to strip from AI output to ensure clean Markdown
 BANNED_PREFIXES = (
     "Here is", "Here are", "Below is", "Sure,", "Certainly",
@@ -67,6 +103,18 @@ BANNED_PREFIXES = (
     "Note that "
 )
 
+# Words ignored when matching projects to the JD: English filler plus
+# generic CV/JD vocabulary that says nothing about the actual work
+STOP_WORDS = frozenset("""
+    a an and are as at be been being but by can for from has have in into is it its
+    of on or our that the their this to was we were will with you your
+    all also any both each more most other over such than then these those very
+    able ability across strong excellent good new using used use within work worked
+    working works team teams responsible responsibilities responsibility role
+    experience experienced years year skills skill knowledge including etc
+    looking join help helped ensure various stakeholders
+""".split())
+
 # Task archetypes for context analysis
 TASK_ARCHETYPES = [
     "data_analytics", "software_engineering", "embedded_systems",
@@ -74,8 +122,46 @@ TASK_ARCHETYPES = [
     "cloud_devops", "manufacturing_quality", "supply_chain",
     "consulting_enablement", "digital_transformation"
 ]
+
+# LaTeX special characters and their escaped forms
+LATEX_REPLACEMENTS = {
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+    "\\": r"\textbackslash{}"
+}
 # =================================================
 
+# Smart punctuation flattening + LaTeX escaping, applied by latex_escape in one str.translate
+_LATEX_TRANSLATION = str.maketrans({
+    "’": "'", "‘": "'", "“": '"', "”": '"', "–": "-", "—": "-",
+    **LATEX_REPLACEMENTS
+})
+
+# libyaml's C parser when available, pure-Python fallback otherwise
+ProfileLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Regex patterns, compiled once instead of on every call
+_WHITESPACE_RE = re.compile(r"\s+")
+_CODE_FENCE_RE = re.compile(r'```[a-zA-Z]*')
+# Whole line (plus its newline) starting with a banned prefix
+_BANNED_LINE_RE = re.compile(
+    r"^[ \t]*(?:" + "|".join(re.escape(p) for p in BANNED_PREFIXES) + r").*(?:\n|$)",
+    re.MULTILINE
+)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+# Skill category line: **Category:** skill, skill
+_SKILL_LINE_RE = re.compile(r"^[ \t]*\*\*(?P<category>[^*\n]+?):\*\*(?P<skills>.*)$", re.MULTILINE)
+_NEWLINES_RE = re.compile(r'\n+')
+_WORD_RE = re.compile(r'\w+')
+_FILENAME_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
 
 # ---------- UTILITIES ----------
 
@@ -88,10 +174,71 @@ def check_ollama_connection():
         print("   Please open a terminal and run: 'ollama serve'")
         sys.exit(1)
 
+def ensure_tex_in_path():
+    """Adds the TeX bin directory to PATH once, so pandoc can find xelatex."""
+    path_dirs = os.environ.get("PATH", "").split(os.pathsep)
+    if TEX_BIN_DIR not in path_dirs:
+        os.environ["PATH"] += os.pathsep + TEX_BIN_DIR
+
+# One client (and connection pool) shared by every request in the run.
+# Created lazily so it binds to the event loop started by asyncio.run().
+_ollama_client = None
+
+def get_ollama_client():
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = ollama.AsyncClient()
+    return _ollama_client
+
+def warm_up_model():
+    """Loads the model into memory ahead of the first section (runs while the user types)."""
+    try:
+        ollama.generate(
+            model=MODEL,
+            prompt="",
+            options={'num_ctx': NUM_CTX, 'num_batch': NUM_BATCH},
+            keep_alive=KEEP_ALIVE
+        )
+    except Exception as e:
+        print(f"⚠️ Warning: Model warm-up failed: {e}")
+
+def warm_up_pdf_toolchain():
+    """
+    Locates pandoc and runs pandoc/xelatex once while the LLM works, so the
+    lookup is cached and the binaries are in the OS file cache for the PDF step.
+    Errors are left for convert_to_pdfs to report.
+    """
+    try:
+        for cmd in ([pypandoc.get_pandoc_path(), "--version"], ["xelatex", "--version"]):
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    except (OSError, RuntimeError):
+        pass
+
 def load_yaml(path):
+    """
+    Parses a YAML file, reusing a pickled copy from the previous run when the
+    file's (mtime, size, inode) signature has not changed.
+    """
     try:
+        st = os.stat(path)
+        signature = (os.path.abspath(path), st.st_mtime_ns, st.st_size, st.st_ino)
+        cache_path = os.path.join(PARSED_YAML_CACHE_DIR, os.path.basename(path) + ".pkl")
+        try:
+            with open(cache_path, "rb") as f:
+                cached_signature, data = pickle.load(f)
+            if cached_signature == signature:
+                return data
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+
         with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+            data = yaml.load(f, Loader=ProfileLoader)
+
+        try:
+            write_atomic(cache_path, pickle.dumps((signature, data), protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            pass
+        return data
     except FileNotFoundError:
         print(f"❌ Error: File not found: {path}")
         sys.exit(1)
@@ -107,54 +254,57 @@ def load_file(path):
         print(f"❌ Error: File not found: {path}")
         sys.exit(1)
 
-def clean_ai_output(text):
-    """Removes code blocks and conversational filler from LLM output."""
-    # Remove markdown code fences
-    text = re.sub(r'```[a-zA-Z]*', '', text)
-    text = text.replace('```', '')
-    
-    # Filter conversational lines
-    cleaned_lines = []
-    for line in text.splitlines():
-        if not any(line.strip().startswith(prefix) for prefix in BANNED_PREFIXES):
-            cleaned_lines.append(line)
-    
-    return "\n".join(cleaned_lines).strip()
+def write_atomic(path, data):
+    """
+    Writes bytes to path via a temp file + os.replace, so an interrupted
+    run never leaves a half-written cache behind.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def content_hash(text):
+    """Fast non-cryptographic cache key (blake2b is implemented in C)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def clean_ai_output(text, max_bullets=None):
+    """
+    Removes code blocks and conversational filler from LLM output.
+    With max_bullets, also caps the bullets per role (see enforce_bullet_limit).
+    """
+    # Remove markdown code fences (bare ``` included)
+    text = _CODE_FENCE_RE.sub('', text)
 
-def extract_json_from_text(text):
-    """Finds and parses JSON object within text."""
-    match = re.search(r'\{.*\}', text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            pass
-    return None
+    # Filter conversational lines in a single regex pass
+    text = _BANNED_LINE_RE.sub('', text)
 
-def flatten_skills(skills_buckets):
-    """Extracts a unique list of all skills from the profile buckets."""
-    flat_list = []
-    for content in skills_buckets.values():
-        flat_list.extend(content.get('items', []))
-    # Remove duplicates and sort
-    return sorted(list(set(flat_list)))
+    if max_bullets is not None:
+        text = enforce_bullet_limit(text, max_bullets)
+
+    return text.strip()
 
 def enforce_bullet_limit(text, max_bullets):
     """
     Parses text line-by-line. 
     Resets bullet count when a non-bullet line (Header) is found.
     """
-    lines = text.split('\n')
     cleaned_lines = []
     current_bullet_count = 0
 
-    for line in lines:
+    for line in text.splitlines():
         line = line.strip()
         if not line: 
             continue  # Skip empty lines to prevent double spacing issues
 
         # Check if line is a bullet point
-        if line.startswith('- ') or line.startswith('* '):
+        if line.startswith(('- ', '* ')):
             if current_bullet_count < max_bullets:
                 cleaned_lines.append(line)
                 current_bullet_count += 1
@@ -170,57 +320,245 @@ def enforce_bullet_limit(text, max_bullets):
     
     return "\n".join(cleaned_lines)
 
+def extract_json_from_text(text):
+    """Parses a JSON reply, falling back to finding the object within prose."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+    match = _JSON_OBJECT_RE.search(text)
+    if match:
+        try:
+            return orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            pass
+    return None
+
+def to_prompt_json(data):
+    """Compact, key-sorted JSON for prompts: fewer tokens, stable prefixes."""
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+
+def build_prompt(jd_excerpt, task):
+    """
+    Puts the shared job context first and the section-specific task last.
+    Every prompt then starts with an identical prefix, which Ollama can
+    reuse from its KV cache instead of re-processing it for each section.
+    """
+    return f"""You are an expert CV writer tailoring application documents to the job below.
+
+JOB DESCRIPTION:
+{jd_excerpt}
+
+TASK:
+{task.strip()}
+"""
+
+def to_compact(rows, fields):
+    """
+    Serializes profile entries for the LLM as one line per entry.
+    A header line names the columns; values are separated by " | " and
+    list items by "; ". Far fewer tokens than the equivalent YAML.
+    Columns that no entry fills are dropped.
+    """
+    fields = [field for field in fields if any(row.get(field) for row in rows)]
+    lines = [" | ".join(fields)]
+    for row in rows:
+        values = []
+        for field in fields:
+            value = row.get(field) or ""
+            if isinstance(value, list):
+                value = "; ".join(str(item) for item in value)
+            values.append(_WHITESPACE_RE.sub(" ", str(value)).strip())
+        lines.append(" | ".join(values))
+    return "\n".join(lines)
+
+def dump_profile_sections(profile):
+    """
+    Serializes the profile sections embedded in prompts once per run,
+    instead of re-running the serializer inside every generator.
+    """
+    # Compact single-line JSON of only the fields the prompts ask for
+    blocks = {
+        key: orjson.dumps([
+            {field: entry[field] for field in fields if entry.get(field)}
+            for entry in profile.get(key) or []
+        ]).decode("utf-8")
+        for key, fields in (("education", EDUCATION_FIELDS), ("certifications", CERTIFICATION_FIELDS))
+    }
+    blocks["experience"] = to_compact(profile.get("experience", []), EXPERIENCE_FIELDS)
+    return blocks
+
+def extract_jd_excerpt(jd_text, max_chars=JD_EXCERPT_CHARS):
+    """
+    Builds the one JD excerpt shared by every prompt.
+    Pasted job ads are full of indentation and blank lines, so squeeze
+    those out first to fit more actual content into the character budget,
+    then cut at a line boundary where possible.
+    """
+    lines = (_WHITESPACE_RE.sub(" ", line).strip() for line in jd_text.splitlines())
+    excerpt = "\n".join(line for line in lines if line)
+    if len(excerpt) <= max_chars:
+        return excerpt
+
+    cut = excerpt.rfind("\n", 0, max_chars)
+    return excerpt[:cut if cut > max_chars // 2 else max_chars]
+
+def tokenize_jd(jd_text):
+    """Lower-cased word set of the JD, built once and shared by the scorers."""
+    return frozenset(_WORD_RE.findall(jd_text.lower()))
+
+def flatten_skills(skills_buckets):
+    """Extracts a unique, sorted list of all skills from the profile buckets."""
+    return sorted({
+        skill
+        for content in skills_buckets.values()
+        for skill in content.get('items', [])
+    })
+
 
 # ---------- LOGIC ENGINES ----------
 
-def pre_filter_projects(all_projects, jd_text):
+def pre_filter_projects(all_projects, jd_tokens):
     """
     Python-side heuristic:
-    Counts how many words from the JD appear in the project details.
+    Scores each project by the JD words it mentions, weighted by IDF across
+    the projects. STOP_WORDS ("the", "team", "responsible") never score, words
+    every project shares score 0, and distinctive matches ("kafka",
+    "tableau") carry the ranking.
     Returns the top N candidates to the LLM to save token space.
     """
     if not all_projects: return []
-    
-    # Normalize JD words
-    jd_tokens = set(re.findall(r'\w+', jd_text.lower()))
-    scored_projects = []
 
+    project_tokens = []
     for p in all_projects:
         # Create a "bag of words" for the project
-        p_content = (
-            str(p.get('name', '')) + " " + 
-            str(p.get('description', '')) + " " + 
-            " ".join(p.get('highlights', []))
-        ).lower()
-        
-        p_tokens = re.findall(r'\w+', p_content)
-        
-        # Calculate score: number of intersecting words
-        score = sum(1 for token in p_tokens if token in jd_tokens)
+        p_content = " ".join((
+            str(p.get('name', '')),
+            str(p.get('description', '')),
+            *p.get('highlights', [])
+        )).lower()
+        project_tokens.append(set(_WORD_RE.findall(p_content)))
+
+    # Document frequency of each word across the projects
+    doc_freq = Counter(token for tokens in project_tokens for token in tokens)
+    n_docs = len(all_projects)
+
+    scored_projects = []
+    for p, p_tokens in zip(all_projects, project_tokens):
+        # Calculate score: summed IDF of the JD words the project mentions
+        score = sum(
+            math.log((n_docs + 1) / (doc_freq[token] + 1))
+            for token in (jd_tokens & p_tokens) - STOP_WORDS
+        )
         scored_projects.append((score, p))
 
-    # Sort by score descending
-    scored_projects.sort(key=lambda x: x[0], reverse=True)
-    
-    # Return top N projects (stripping the score)
-    return [p for s, p in scored_projects[:CANDIDATE_POOL_SIZE]]
+    # Return top N projects by score (stripping the score); ties keep profile order
+    top = heapq.nlargest(CANDIDATE_POOL_SIZE, scored_projects, key=itemgetter(0))
+    return [p for s, p in top]
+
+
+# ---------- SEMANTIC CACHE ----------
+
+def load_semantic_cache():
+    """Loads section outputs cached by previous runs, skipping malformed entries."""
+    try:
+        with open(SEMANTIC_CACHE_PATH, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        print(f"⚠️ Warning: Ignoring semantic cache: {e}")
+        return []
+    if not isinstance(entries, list):
+        return []
+    return [
+        entry for entry in entries
+        if isinstance(entry, dict) and isinstance(entry.get("embedding"), list)
+    ]
+
+def save_semantic_cache(entries):
+    try:
+        write_atomic(SEMANTIC_CACHE_PATH, json.dumps(entries[-SEMANTIC_CACHE_MAX_ENTRIES:]).encode("utf-8"))
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save semantic cache: {e}")
+
+def hash_profile_slice(data):
+    """Stable hash of the profile data a section is generated from."""
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return content_hash(payload)
+
+def cosine_similarity(a, b):
+    if len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+async def embed_text(text):
+    """
+    Embeds text with the local embedding model.
+    Returns None (cache disabled) if the model isn't available.
+    """
+    try:
+        response = await get_ollama_client().embed(
+            model=EMBED_MODEL,
+            input=text,
+            keep_alive=KEEP_ALIVE
+        )
+        return response["embeddings"][0]
+    except Exception as e:
+        print(f"⚠️ Semantic cache disabled ({EMBED_MODEL}): {e}")
+        return None
+
+async def semantic_cached(entries, section, profile_slice, jd_embedding, make):
+    """
+    Returns the cached output of a section generated from the same profile
+    slice for a similar JD. Otherwise awaits make() and records its result.
+    """
+    # Only reuse outputs from near-deterministic sampling
+    if jd_embedding is None or TEMPERATURE > 0.2:
+        return await make()
+
+    slice_hash = hash_profile_slice(profile_slice)
+    for entry in reversed(entries):
+        if (entry.get("section") == section
+                and entry.get("model") == MODEL
+                and entry.get("embed_model") == EMBED_MODEL
+                and entry.get("prompt_version") == PROMPT_VERSION
+                and entry.get("profile_hash") == slice_hash
+                and "value" in entry
+                and cosine_similarity(entry["embedding"], jd_embedding) >= SEMANTIC_CACHE_THRESHOLD):
+            print(f"--> ♻️  Reusing cached {section} (similar job description)")
+            return entry["value"]
+
+    value = await make()
+    if value:
+        entries.append({
+            "section": section,
+            "model": MODEL,
+            "embed_model": EMBED_MODEL,
+            "prompt_version": PROMPT_VERSION,
+            "profile_hash": slice_hash,
+            "embedding": jd_embedding,
+            "value": value
+        })
+    return value
 
 
 # ---------- AI GENERATORS ----------
 
-def generate_professional_summary(profile, jd, archetypes):
+async def generate_professional_summary(profile, jd_excerpt, archetypes):
     """
     Generates a 3-4 sentence professional summary tailored to the JD.
     """
     basics = profile.get('basics', {})
     current_role = basics.get('label', 'Professional')
     
-    prompt = f"""
+    prompt = build_prompt(jd_excerpt, f"""
         Write a generic but powerful Professional Summary (Profile) for a CV.
         
         MY ROLE: {current_role}
         TARGET ARCHETYPES: {archetypes}
-        JOB DESCRIPTION HIGHLIGHTS: {jd[:800]}
         
         MY BACKGROUND SUMMARY:
         {basics.get('summary', '')}
@@ -233,56 +571,213 @@ def generate_professional_summary(profile, jd, archetypes):
         5. Output plain text only. No headers.
         6. Use ONLY the provided skills.
         7. Do not hallucinate.
-        """
+        """)
     
-    return generate(prompt, "Professional Summary")
+    return await generate(prompt, "Professional Summary")
 
 
-def generate(prompt, label):
-    print(f"--> 🧠 Generating {label}...")
+# Generations shared between identical prompts (see generate)
+_inflight = {}
+_completed = {}
+
+def load_generation_cache():
+    """
+    Seeds the completed-generation memo with results from previous runs.
+    The key covers model, temperature and the full prompt, so any change
+    to the profile data, JD or archetypes a section uses is a cache miss.
+    """
+    if not USE_GENERATION_CACHE:
+        return
     try:
-        response = ollama.chat(
-            model=MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            options={'temperature': 0.2} # Low temp for strict adherence
-        )
-        return clean_ai_output(response["message"]["content"])
-    except Exception as e:
-        print(f"⚠️ Error generating {label}: {e}")
-        return ""
+        with open(GENERATION_CACHE_PATH, "rb") as f:
+            cached = orjson.loads(f.read())
+    except FileNotFoundError:
+        return
+    except (OSError, orjson.JSONDecodeError) as e:
+        print(f"⚠️ Warning: Ignoring generation cache: {e}")
+        return
+    if isinstance(cached, dict):
+        _completed.update(cached)
+
+def save_generation_cache():
+    if not USE_GENERATION_CACHE:
+        return
+    recent = dict(list(_completed.items())[-GENERATION_CACHE_MAX_ENTRIES:])
+    try:
+        write_atomic(GENERATION_CACHE_PATH, orjson.dumps(recent))
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save generation cache: {e}")
+
+# Limits concurrent requests to what the Ollama server can actually run.
+# Created lazily so it binds to the event loop started by asyncio.run().
+_llm_semaphore = None
+
+def get_llm_semaphore():
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(OLLAMA_CONCURRENCY)
+    return _llm_semaphore
+
+async def generate(prompt, label, max_bullets=None, response_format=None, max_tokens=MAX_TOKENS_MEDIUM):
+    """
+    Single-flight wrapper around the model call.
+    Concurrent callers with an identical prompt await the same request,
+    and successful results are reused for the rest of the run.
+    response_format="json" asks Ollama for a valid JSON reply;
+    max_tokens caps how many tokens the model may decode.
+    """
+    key = content_hash(f"{MODEL}|{PROMPT_VERSION}|{TEMPERATURE}|{max_bullets}|{response_format}|{max_tokens}|{prompt}")
+    if key in _completed:
+        print(f"--> ♻️  Reusing {label} (unchanged inputs)")
+        # Move to the end so save_generation_cache keeps recently used entries
+        _completed[key] = _completed.pop(key)
+        return _completed[key]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(stream_completion(prompt, label, max_bullets, response_format, max_tokens))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    text = await task
+    # A JSON reply cut off at num_predict would otherwise be reused on every run
+    if text and (response_format != "json" or extract_json_from_text(text) is not None):
+        _completed[key] = text
+    return text
 
-def identify_archetypes(jd):
-    prompt = f"""
+async def generate_stream(prompt, response_format=None, max_tokens=MAX_TOKENS_MEDIUM):
+    """
+    Yields the raw response text chunk by chunk as the model decodes it.
+    """
+    stream = await get_ollama_client().chat(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        options={
+            'temperature': TEMPERATURE,
+            'num_ctx': NUM_CTX,
+            'num_batch': NUM_BATCH,
+            'num_predict': max_tokens
+        },
+        format=response_format or '',
+        stream=True,
+        keep_alive=KEEP_ALIVE
+    )
+    try:
+        async for chunk in stream:
+            yield chunk["message"]["content"]
+    finally:
+        # Closing the response stream ends the request, so Ollama stops decoding
+        await stream.aclose()
+
+def track_json_depth(chunk, state):
+    """
+    Advances a brace scan over the next chunk of a streamed JSON reply.
+    state is (depth, in_string, escaped, started); the top-level object
+    is complete once it has started and depth is back to 0.
+    """
+    depth, in_string, escaped, started = state
+    for ch in chunk:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+            started = True
+        elif ch == "}":
+            depth -= 1
+            if started and depth == 0:
+                break
+    return depth, in_string, escaped, started
+
+async def stream_completion(prompt, label, max_bullets=None, response_format=None, max_tokens=MAX_TOKENS_MEDIUM):
+    """
+    Collects a streamed completion so independent sections can overlap.
+    At most OLLAMA_CONCURRENCY requests are in flight at a time.
+    """
+    async with get_llm_semaphore():
+        print(f"--> 🧠 Generating {label}...")
+        try:
+            parts = []
+            json_state = (0, False, False, False)
+            stream = generate_stream(prompt, response_format, max_tokens)
+            try:
+                async for token in stream:
+                    parts.append(token)
+                    if STREAM_TO_CONSOLE:
+                        print(token, end="", flush=True)
+                    if response_format == "json":
+                        json_state = track_json_depth(token, json_state)
+                        if json_state[3] and json_state[0] == 0:
+                            break  # Object complete: don't wait for trailing whitespace
+            finally:
+                await stream.aclose()
+            if STREAM_TO_CONSOLE:
+                print()
+            text = "".join(parts)
+            if response_format:
+                return text.strip()  # Structured output has no prose to clean
+            return clean_ai_output(text, max_bullets)
+        except Exception as e:
+            print(f"⚠️ Error generating {label}: {e}")
+            return ""
+
+async def identify_archetypes(jd_excerpt):
+    prompt = build_prompt(jd_excerpt, f"""
         Analyze the Job Description and identify the top 3 relevant archetypes from this list:
         {TASK_ARCHETYPES}
         
         Return ONLY a JSON object: {{ "archetypes": ["match1", "match2"] }}
-        
-        Job Description:
-        {jd[:1500]}
-        """
-    raw = generate(prompt, "Archetype Analysis")
+        """)
+    raw = await generate(prompt, "Archetype Analysis", response_format="json", max_tokens=MAX_TOKENS_SHORT)
     data = extract_json_from_text(raw)
     return data.get("archetypes", []) if data else []
 
 
-def clean_skills_output(text):
+async def generate_selections(profile, jd_excerpt):
     """
-    Removes any explanatory lines accidentally added by the LLM.
-    Keeps only lines that look like skill categories.
+    Makes the short-form picks in one call instead of three:
+    archetypes, soft skills, and tech skills grouped by category.
+    Returns the parsed JSON object, or an empty dict if parsing failed.
     """
-    cleaned = []
+    all_skills = flatten_skills(profile.get("skills_buckets", {}))
+    soft_pool = profile.get("soft_skills", [])
 
-    for line in text.splitlines():
-        line = line.strip()
+    prompt = build_prompt(jd_excerpt, f"""
+        Analyze the Job Description and make three selections for a tailored CV.
+
+        ARCHETYPE OPTIONS:
+        {TASK_ARCHETYPES}
 
-        # Keep only category lines like: **Category:** ...
-        if re.match(r"\*\*.+?\:\*\*", line):
-            cleaned.append(line)
+        MY MASTER SKILL LIST:
+        {to_prompt_json(all_skills)}
 
-    return "\n".join(cleaned)
+        MY SOFT SKILLS POOL:
+        {to_prompt_json(soft_pool)}
 
-def generate_smart_soft_skills(profile, jd):
+        INSTRUCTIONS:
+        1. "archetypes": the top 3 relevant archetypes from the options.
+        2. "soft_skills": 3 or 4 soft skills from my pool that best fit the job.
+        3. "skills_by_category": ONLY the skills from my master list that are relevant to this job,
+           grouped into 3–4 logical categories named specifically for this role.
+        4. Do NOT invent archetypes or skills. Use ONLY the provided lists.
+        5. Do NOT include a "Languages" category (I will add this manually).
+        6. AVOID REDUNDANCY: If a skill name is contained in the Category Name, OMIT it from that category.
+
+        Return ONLY a JSON object:
+        {{ "archetypes": ["match1", "match2"], "soft_skills": ["Skill 1", "Skill 2"], "skills_by_category": {{ "Category Name": ["Skill", "Skill"] }} }}
+        """)
+    raw = await generate(prompt, "Archetype & Skill Selection", response_format="json")
+    data = extract_json_from_text(raw)
+    return data if isinstance(data, dict) else {}
+
+
+async def generate_smart_soft_skills(profile, jd_excerpt):
     """
     Selects the top 3-4 soft skills from the profile based on the JD.
     """
@@ -292,39 +787,37 @@ def generate_smart_soft_skills(profile, jd):
     if not soft_pool:
         return ""
 
-    prompt = f"""
+    prompt = build_prompt(jd_excerpt, f"""
     Select the top 4 Soft Skills from the list below that are most relevant to this Job.
     
-    JOB EXCERPT: {jd[:800]}
-    
     MY SOFT SKILLS POOL:
-    {json.dumps(soft_pool)}
+    {to_prompt_json(soft_pool)}
     
     INSTRUCTIONS:
     1. Select exactly 3 or 4 skills that best fit the job description.
     2. Format strictly as: **Soft Skills:** Skill 1, Skill 2, Skill 3
     3. Do NOT invent new skills. Use ONLY the provided list.
     4. Output ONLY the single formatted line.
-    """
+    """)
     
-    return generate(prompt, "Smart Soft Skills")
+    return await generate(prompt, "Smart Soft Skills", max_tokens=MAX_TOKENS_SHORT)
 
 
-def generate_smart_skills(profile, jd, archetypes):
+async def generate_skill_lines(profile, jd_excerpt, archetypes):
     """
     Feeds ALL skills to the LLM and asks it to curate a specific list.
+    Returns the raw (tech skills, soft skills) outputs.
     """
     all_skills = flatten_skills(profile.get("skills_buckets", {}))
     
-    prompt = f"""
+    prompt = build_prompt(jd_excerpt, f"""
         Create a highly targeted 'Skills' section for a CV.
 
         JOB CONTEXT:
         Archetypes: {archetypes}
-        JD Excerpt: {jd[:1000]}
 
         MY MASTER SKILL LIST:
-        {json.dumps(all_skills)}
+        {to_prompt_json(all_skills)}
 
         INSTRUCTIONS:
         1. Select ONLY the skills from my list that are relevant to this job.
@@ -341,31 +834,78 @@ def generate_smart_skills(profile, jd, archetypes):
             OMIT the skill from the list. 
             (Example: If Category is 'Data Analysis', do NOT list 'Data Analysis' inside it. 
             Just list the tools like 'Pandas', 'Excel').
-        """
+        """)
+
+    # Tech skills and soft skills are independent prompts, so run them together
+    return await asyncio.gather(
+        generate(prompt, "Smart Skills Section"),
+        generate_smart_soft_skills(profile, jd_excerpt)
+    )
 
-    # --- Safety Net: Clean Tech Skills Redundancy ---
-    raw_ai_skills = generate(prompt, "Smart Skills Section")
-    cleaned_tech_skills = clean_skills_output(raw_ai_skills)
 
+def format_selected_skills(selections, profile):
+    """
+    Turns the picks from generate_selections into the same
+    (tech skills, soft skills) lines the skill prompts produce.
+    Only skills that exist in the profile are kept.
+    Returns None if the selections contain no usable skill groups.
+    """
+    by_category = selections.get("skills_by_category")
+    if not isinstance(by_category, dict):
+        return None
+
+    known_skills = set(flatten_skills(profile.get("skills_buckets", {})))
+    tech_lines = []
+    for category, skills in by_category.items():
+        if not isinstance(skills, list):
+            continue
+        valid = [s for s in skills if isinstance(s, str) and s in known_skills]
+        if valid:
+            tech_lines.append(f"**{category}:** {', '.join(valid)}")
+    if not tech_lines:
+        return None
+
+    # No soft skills in the YAML means no soft skills line
+    soft_pool = set(profile.get("soft_skills", []))
+    soft_skills = selections.get("soft_skills")
+    soft_line = ""
+    if soft_pool and isinstance(soft_skills, list):
+        valid = [s for s in soft_skills if isinstance(s, str) and s in soft_pool]
+        if valid:
+            soft_line = "**Soft Skills:** " + ", ".join(valid)
+
+    return "\n".join(tech_lines), soft_line
+
+
+async def generate_smart_skills(profile, jd_excerpt, archetypes, selections=None):
+    """
+    Builds the Skills section: tech skills, soft skills and languages.
+    Reuses the picks from generate_selections when they are usable and
+    only falls back to the dedicated skill prompts otherwise.
+    """
+    # --- PART 1: Tech & Soft Skills (AI, selected together) ---
+    selected = format_selected_skills(selections or {}, profile)
+    if selected:
+        raw_ai_skills, smart_soft_skills = selected
+    else:
+        raw_ai_skills, smart_soft_skills = await generate_skill_lines(profile, jd_excerpt, archetypes)
+
+    # --- Safety Net: Keep only category lines, minus skills that repeat the category name ---
     final_tech_lines = []
-    for line in cleaned_tech_skills.split('\n'):
-        if ':' in line:
-            category_part, skills_part = line.split(':', 1)
-            clean_cat = category_part.replace('*', '').strip().lower()
-            
-            # Filter skills that repeat the category name
-            filtered = [s.strip() for s in skills_part.split(',') 
-                        if s.strip().lower() not in clean_cat]
-            
-            if filtered:
-                final_tech_lines.append(f"{category_part}: {', '.join(filtered)}")
-        else:
-            final_tech_lines.append(line)
+    for match in _SKILL_LINE_RE.finditer(raw_ai_skills):
+        category = match["category"].strip()
+        clean_cat = category.lower()
 
-    # --- PART 2: Smart Soft Skills (AI) ---
-    smart_soft_skills = generate_smart_soft_skills(profile, jd)
+        filtered = []
+        for skill in match["skills"].split(','):
+            skill = skill.strip()
+            if skill.lower() not in clean_cat:
+                filtered.append(skill)
 
-    # --- PART 3: Languages (Python Mandatory) ---
+        if filtered:
+            final_tech_lines.append(f"**{category}:** {', '.join(filtered)}")
+
+    # --- PART 2: Languages (Python Mandatory) ---
     languages = profile.get('languages', [])
     formatted_languages = ""
     if languages:
@@ -381,7 +921,7 @@ def generate_smart_skills(profile, jd, archetypes):
         if lang_entries:
             formatted_languages = "**Languages:** " + ", ".join(lang_entries)
 
-    # --- PART 4: Combine All ---
+    # --- PART 3: Combine All ---
     # We use a list to join them with newlines, filtering out empty strings
     sections = [
         "\n".join(final_tech_lines),
@@ -393,22 +933,20 @@ def generate_smart_skills(profile, jd, archetypes):
     return "\n".join([s for s in sections if s]).strip()
 
 
-def generate_smart_projects(profile, jd, archetypes):
+async def generate_smart_projects(profile, jd_excerpt, archetypes, candidates):
     all_projects = profile.get("projects", [])
     if not all_projects: return ""
 
-    # 1. Python Pre-filter
-    candidates = pre_filter_projects(all_projects, jd)
+    # 1. Python Pre-filter (scored against the full JD by the caller)
     print(f"    (Filtered {len(all_projects)} total projects down to {len(candidates)} candidates)")
 
     # 2. LLM Selection
-    prompt = f"""
+    prompt = build_prompt(jd_excerpt, f"""
         Select the best {MAX_PROJECTS_TO_SHOW} projects from the candidates below.
         
-        JOB CONTEXT: {jd[:1000]}
-        
-        CANDIDATE PROJECTS:
-        {yaml.dump(candidates)}
+        CANDIDATE PROJECTS (one project per line, columns as named in the first line,
+        list items separated by ";"):
+        {to_compact(candidates, PROJECT_FIELDS)}
         
         INSTRUCTIONS:
         1. Pick exactly {MAX_PROJECTS_TO_SHOW} projects.
@@ -425,20 +963,20 @@ def generate_smart_projects(profile, jd, archetypes):
         5. NO intro text.
         6. Use "-" only.
         8. Do not put the dat/year in quotations.
-        """
-    return generate(prompt, "Smart Projects Section")
+        """)
+    return await generate(prompt, "Smart Projects Section", max_tokens=MAX_TOKENS_LONG)
 
 
-def generate_experience(profile, jd, archetypes):
+async def generate_experience(jd_excerpt, archetypes, experience_rows):
 
-    prompt = f"""
+    prompt = build_prompt(jd_excerpt, f"""
         Rewrite the EXPERIENCE section for a CV.
 
         CONTEXT: {archetypes}
-        JD SUMMARY: {jd[:600]}
 
-        EXPERIENCE:
-        {yaml.dump(profile['experience'])}
+        EXPERIENCE (one role per line, columns as named in the first line,
+        list items separated by ";"):
+        {experience_rows}
 
         INSTRUCTIONS:
         1. Output plain text.
@@ -454,19 +992,16 @@ def generate_experience(profile, jd, archetypes):
         5. Use "-" only.
         6. If required, add upto 5 points.
         7. Make sure all the points are ATS friendly and compliant.
-        """
+        """)
 
-    text = generate(prompt, "Experience Section")
-    text = enforce_bullet_limit(text, MAX_BULLETS_PER_ROLE)
+    # Bullet limit is applied while cleaning the output
+    return await generate(prompt, "Experience Section", MAX_BULLETS_PER_ROLE, max_tokens=MAX_TOKENS_LONG)
 
-    return text
 
-
-def generate_cover_letter(profile, jd, archetypes):
-    prompt = f"""
+async def generate_cover_letter(profile, jd_excerpt, archetypes):
+    prompt = build_prompt(jd_excerpt, f"""
         Write a German-market style Cover Letter BODY.
         
-        JOB: {jd[:800]}
         ARCHETYPES: {archetypes}
         
         CANDIDATE:
@@ -479,24 +1014,23 @@ def generate_cover_letter(profile, jd, archetypes):
         2. Tone: Professional, direct, enthusiastic.
         3. Highlight specific overlap between my profile and the job.
         4. No placeholders.
-        """
-    return generate(prompt, "Cover Letter")
+        """)
+    return await generate(prompt, "Cover Letter", max_tokens=MAX_TOKENS_LONG)
 
-def generate_smart_education(profile, jd, archetypes):
+async def generate_smart_education(profile, jd_excerpt, archetypes, education_json):
     education = profile.get("education", [])
 
     if not education:
         return ""
 
-    prompt = f"""
+    prompt = build_prompt(jd_excerpt, f"""
         Create a targeted EDUCATION section for a CV.
 
         JOB CONTEXT:
         Archetypes: {archetypes}
-        JD Excerpt: {jd[:800]}
 
         EDUCATION DATA:
-        {yaml.dump(education)}
+        {education_json}
 
         INSTRUCTIONS:
         1. Keep each degree.
@@ -510,25 +1044,24 @@ def generate_smart_education(profile, jd, archetypes):
         6. Keep it concise.
         7. Do not give any headings, such as 'EDUCATION'
         8. Bold only the degree name, not the instituition and dates
-        """
+        """)
 
-    return generate(prompt, "Smart Education Section")
+    return await generate(prompt, "Smart Education Section")
 
-def generate_smart_certifications(profile, jd, archetypes):
+async def generate_smart_certifications(profile, jd_excerpt, archetypes, certifications_json):
     certs = profile.get("certifications", [])
 
     if not certs:
         return ""
 
-    prompt = f"""
+    prompt = build_prompt(jd_excerpt, f"""
         Create a targeted CERTIFICATIONS section for a CV.
 
         JOB CONTEXT:
         Archetypes: {archetypes}
-        JD Excerpt: {jd[:800]}
 
         MY CERTIFICATIONS:
-        {yaml.dump(certs)}
+        {certifications_json}
 
 
         INSTRUCTIONS:
@@ -542,37 +1075,52 @@ def generate_smart_certifications(profile, jd, archetypes):
         5. Do NOT write any headers or labels.
         6. Do NOT invent certifications.
         7. No explanations.
-        """
-
-    return generate(prompt, "Smart Certifications Section")
-
-def convert_md_to_pdf(md_file, pdf_file):
-
-    print("🔧 Generating PDF...")
-
-    try:
-        os.environ["PATH"] += os.pathsep + "/Library/TeX/texbin"
-
-        template_path = os.path.abspath("resume_template.tex")
-        print("📄 Using template:", template_path)
-
-        output = pypandoc.convert_file(
-            md_file,
-            "pdf",
-            outputfile=pdf_file,
-            extra_args=[
-                "--pdf-engine=xelatex",
-                "--template=resume_rendered.tex",
-                "--wrap=preserve"
-            ]
-        )
-
-        print("Pandoc output:", output)
-        print(f"✅ PDF created: {pdf_file}")
+        """)
+
+    return await generate(prompt, "Smart Certifications Section", max_tokens=MAX_TOKENS_SHORT)
+
+def pandoc_pdf_command(md_file, pdf_file, extra_args=()):
+    """Builds the pandoc argv for a Markdown → PDF conversion via xelatex."""
+    return [
+        pypandoc.get_pandoc_path(),
+        "--from=markdown",
+        "--to=pdf",
+        md_file,
+        f"--output={pdf_file}",
+        "--pdf-engine=xelatex",
+        "--wrap=preserve",
+        *extra_args
+    ]
 
-    except Exception as e:
-        print("❌ PDF conversion failed:")
-        print("Error:", e)
+def convert_to_pdfs(jobs):
+    """
+    Converts (label, md_file, pdf_file, extra_args) jobs to PDF.
+    Each job is its own pandoc/xelatex process and all of them run at once,
+    so the total wait is the slowest conversion instead of the sum.
+    """
+    running = []
+    for label, md_file, pdf_file, extra_args in jobs:
+        print(f"🔧 Generating {label} PDF...")
+        try:
+            proc = subprocess.Popen(
+                pandoc_pdf_command(md_file, pdf_file, extra_args),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+        except OSError as e:
+            print(f"❌ {label} PDF conversion failed:")
+            print("Error:", e)
+            continue
+        running.append((label, pdf_file, proc))
+
+    for label, pdf_file, proc in running:
+        _, err = proc.communicate()
+        if proc.returncode == 0:
+            print(f"✅ {label} PDF created: {pdf_file}")
+        else:
+            print(f"❌ {label} PDF conversion failed:")
+            print("Error:", err.strip())
 
 
 def normalize_spacing(text):
@@ -582,47 +1130,93 @@ def normalize_spacing(text):
     if not text:
         return ""
 
-    # Ensure double line breaks between paragraphs
-    text = re.sub(r'\n{2,}', '\n\n', text)
-    text = re.sub(r'(?<!\n)\n(?!\n)', '\n\n', text)
+    # Ensure exactly one blank line between blocks: any newline run becomes "\n\n"
+    text = _NEWLINES_RE.sub('\n\n', text)
 
     return text.strip()
 
-def convert_cover_letter_to_pdf(md_file, pdf_file):
-
-    print("🔧 Generating Cover Letter PDF...")
-
-    try:
-        os.environ["PATH"] += os.pathsep + "/Library/TeX/texbin"
-
-        output = pypandoc.convert_file(
-            md_file,
-            "pdf",
-            outputfile=pdf_file,
-            extra_args=[
-                "--pdf-engine=xelatex",
-                "--wrap=preserve"
-            ]
-        )
+async def generate_all_sections(profile, jd_text):
+    """
+    Identifies archetypes and skill picks, then generates every section
+    concurrently. None of the sections depend on each other's output, so
+    the total wait is roughly the slowest section instead of the sum of all.
+    Selections, education and certifications are reused from the semantic
+    cache when a similar JD was processed with the same profile data.
+    """
+    # One excerpt for every prompt keeps the prompt prefixes identical
+    jd_excerpt = extract_jd_excerpt(jd_text)
+    jd_tokens = tokenize_jd(jd_text)
+    load_generation_cache()
+    cache = load_semantic_cache()
+    cache_size = len(cache)
+
+    # Local prep takes microseconds; it is done once here and shared by every section
+    profile_blocks = dump_profile_sections(profile)
+    candidates = pre_filter_projects(profile.get("projects", []), jd_tokens)
+
+    jd_embedding = await embed_text(jd_excerpt)
+    selections = await semantic_cached(
+        cache, "selections",
+        [profile.get("skills_buckets"), profile.get("soft_skills")],
+        jd_embedding,
+        lambda: generate_selections(profile, jd_excerpt)
+    )
+    archetypes = selections.get("archetypes")
+    if not isinstance(archetypes, list):
+        archetypes = await identify_archetypes(jd_excerpt)
+    print(f"\n🔎 Identified Archetypes: {archetypes}\n")
 
-        print(f"✅ Cover Letter PDF created: {pdf_file}")
+    (summary, education, skills, certs,
+     projects, experience, cover_letter) = await asyncio.gather(
+        generate_professional_summary(profile, jd_excerpt, archetypes),
+        semantic_cached(
+            cache, "education", profile.get("education"), jd_embedding,
+            lambda: generate_smart_education(profile, jd_excerpt, archetypes, profile_blocks["education"])
+        ),
+        generate_smart_skills(profile, jd_excerpt, archetypes, selections),
+        semantic_cached(
+            cache, "certifications", profile.get("certifications"), jd_embedding,
+            lambda: generate_smart_certifications(profile, jd_excerpt, archetypes, profile_blocks["certifications"])
+        ),
+        generate_smart_projects(profile, jd_excerpt, archetypes, candidates),
+        generate_experience(jd_excerpt, archetypes, profile_blocks["experience"]),
+        generate_cover_letter(profile, jd_excerpt, archetypes)
+    )
 
-    except Exception as e:
-        print("❌ Cover Letter PDF conversion failed:")
-        print("Error:", e)
+    save_generation_cache()
+    if len(cache) != cache_size:
+        save_semantic_cache(cache)
+
+    return {
+        "summary": summary,
+        "education": education,
+        "skills": skills,
+        "certifications": certs,
+        "projects": projects,
+        "experience": experience,
+        "cover_letter": cover_letter
+    }
 
 
 # ---------- MAIN EXECUTION ----------
 
 if __name__ == "__main__":
     check_ollama_connection()
+    ensure_tex_in_path()
+    # Load the model and the PDF tools in the background while the company name and JD are entered
+    threading.Thread(target=warm_up_model, daemon=True).start()
+    threading.Thread(target=warm_up_pdf_toolchain, daemon=True).start()
     
-    DOCS_DIR = "docs"
     os.makedirs(DOCS_DIR, exist_ok=True)
 
-    # Load Data
-    profile = load_yaml(PROFILE_PATH)
-    template_str = load_file(TEMPLATE_PATH)
+    # Load Data (file reads and YAML parsing overlap)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        profile_future = pool.submit(load_yaml, PROFILE_PATH)
+        template_future = pool.submit(load_file, TEMPLATE_PATH)
+        latex_template_future = pool.submit(load_file, "resume_template.tex")
+    profile = profile_future.result()
+    template_str = template_future.result()
+    latex_template_str = latex_template_future.result()
 
 
     # Escape LaTeX-sensitive fields (IMPORTANT)
@@ -637,7 +1231,7 @@ if __name__ == "__main__":
     company_input = input("Target Company: ").strip()
     
     # Sanitize company name for filename (remove spaces/special chars)
-    company_safe = re.sub(r'[^a-zA-Z0-9_-]', '', company_input.replace(' ', '_'))
+    company_safe = _FILENAME_UNSAFE_RE.sub('', company_input.replace(' ', '_'))
     if not company_safe:
         company_safe = "General"
     
@@ -646,31 +1240,26 @@ if __name__ == "__main__":
     print("📋 PASTE JOB DESCRIPTION (Type 'DONE' to finish)")
     print("=" * 50)
     
+    # Read the pasted block straight from the buffered stdin (ends at DONE or EOF)
     lines = []
-    while True:
-        try:
-            line = input()
-            if line.strip() == "DONE":
-                break
-            lines.append(line)
-        except EOFError:
+    for line in sys.stdin:
+        if line.strip() == "DONE":
             break
+        lines.append(line)
 
-    jd_text = "\n".join(lines)
+    jd_text = "".join(lines).rstrip("\n")
 
-    # 1. Analyze
-    archetypes = identify_archetypes(jd_text)
-    print(f"\n🔎 Identified Archetypes: {archetypes}\n")
+    # 1. Analyze & 2. Generate Content (sections run concurrently)
+    sections = asyncio.run(generate_all_sections(profile, jd_text))
 
-    # 2. Generate Content
-    summary_md = normalize_spacing(generate_professional_summary(profile, jd_text, archetypes))
-    education_md = normalize_spacing(generate_smart_education(profile, jd_text, archetypes))
-    skills_md = normalize_spacing(generate_smart_skills(profile, jd_text, archetypes))
-    certs_md = normalize_spacing(generate_smart_certifications(profile, jd_text, archetypes))
-    projects_md = normalize_spacing(generate_smart_projects(profile, jd_text, archetypes))
-    experience_md = normalize_spacing(generate_experience(profile, jd_text, archetypes))
+    summary_md = normalize_spacing(sections["summary"])
+    education_md = normalize_spacing(sections["education"])
+    skills_md = normalize_spacing(sections["skills"])
+    certs_md = normalize_spacing(sections["certifications"])
+    projects_md = normalize_spacing(sections["projects"])
+    experience_md = normalize_spacing(sections["experience"])
 
-    cover_letter_md = generate_cover_letter(profile, jd_text, archetypes)
+    cover_letter_md = sections["cover_letter"]
 
     # 3. Render Markdown Template (Jinja → Markdown)
     template = Template(
@@ -690,16 +1279,12 @@ if __name__ == "__main__":
     )
 
     # 4. Render LaTeX Template (Jinja → LaTeX)
-    latex_template_str = load_file("resume_template.tex")
     latex_template = Template(latex_template_str)
 
     rendered_latex = latex_template.render(
         basics=escaped_basics
     )
 
-    with open("resume_rendered.tex", "w", encoding="utf-8") as f:
-        f.write(rendered_latex)
-
     # 5. Save Markdown & Cover Letter
     today_iso = date.today().isoformat()
 
@@ -712,14 +1297,24 @@ if __name__ == "__main__":
     with open(cl_filename, "w", encoding="utf-8") as f:
         f.write(cover_letter_md)
 
-    # 6. Convert CV to PDF (using rendered LaTeX template)
+    # 6. Convert CV (using rendered LaTeX template) and Cover Letter to PDF, in parallel
     pdf_filename = os.path.join(DOCS_DIR, f"CV_{company_safe}_{today_iso}.pdf")
+    cl_pdf_filename = os.path.join(DOCS_DIR, f"CoverLetter_{company_safe}_{today_iso}.pdf")
 
-    convert_md_to_pdf(cv_filename, pdf_filename)
+    # Transient: only pandoc reads it, so keep it in the temp dir, not the project folder
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".tex", prefix="resume_rendered_", encoding="utf-8", delete=False
+    ) as f:
+        f.write(rendered_latex)
+        rendered_latex_path = f.name
 
-    # Convert Cover Letter to PDF
-    cl_pdf_filename = os.path.join(DOCS_DIR, f"CoverLetter_{company_safe}_{today_iso}.pdf")
-    convert_cover_letter_to_pdf(cl_filename, cl_pdf_filename)
+    try:
+        convert_to_pdfs([
+            ("CV", cv_filename, pdf_filename, [f"--template={rendered_latex_path}"]),
+            ("Cover Letter", cl_filename, cl_pdf_filename, [])
+        ])
+    finally:
+        os.unlink(rendered_latex_path)
 
     print("\n" + "=" * 50)
     print("✅ GENERATION COMPLETE")